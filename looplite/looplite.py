@@ -1,17 +1,167 @@
 import re
 import logging
 import asyncio
+import signal
+import socket
+import sys
+import threading
 import json
+import math
 import datetime
 from typing import Union
 from urllib.parse import urlparse, parse_qs
 from dataclasses import dataclass, field
+from functools import cached_property
+from http import HTTPStatus
 import inspect
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import httptools
+except ImportError:
+    httptools = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
+_log = logging.getLogger(__name__)
+
+
+# JSON codec: orjson when available, stdlib json otherwise.
+# Both return/accept bytes so callers never need an extra encode/decode step.
+def _stdlib_json_dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+if orjson is not None:
+    def _json_dumps(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # Values orjson refuses but json accepts, e.g. integers beyond 64 bits
+            return _stdlib_json_dumps(obj)
+
+    _json_loads = orjson.loads
+else:
+    _json_dumps = _stdlib_json_dumps
+    _json_loads = json.loads
+
+
+# Status lines are pre-encoded once per status code and reused for every response
+_STATUS_LINES = {
+    200: b"HTTP/1.1 200 OK\r\n",
+    404: b"HTTP/1.1 404 Not Found\r\n",
+    500: b"HTTP/1.1 500 Internal Server Error\r\n",
+}
+
+
+def _status_line(status_code: int) -> bytes:
+    line = _STATUS_LINES.get(status_code)
+    if line is None:
+        try:
+            phrase = HTTPStatus(status_code).phrase
+        except ValueError:
+            phrase = "Unknown Status"
+        line = _STATUS_LINES[status_code] = f"HTTP/1.1 {status_code} {phrase}\r\n".encode()
+    return line
+
+
+# Identical on every miss, so it is serialized once
+_NOT_FOUND_BODY = _json_dumps({"error": "Not Found"})
+
+# <variable> placeholder in route paths
+_VAR_RE = re.compile(r'<([^>]+)>')
+
+
+def _split_target(target: str) -> tuple:
+    """
+    Splits a request target into (path, query) with plain string partitions.
+    Only absolute-form targets ("http://host/path") go through urlparse.
+    """
+    if target[:1] != "/":
+        parsed_url = urlparse(target)
+        return parsed_url.path, parsed_url.query
+    path, _, query = target.partition("#")[0].partition("?")
+    return path, query
+
+
+def _parse_query(query: str) -> dict:
+    if not query:
+        return {}
+    return {k: v[0] for k, v in parse_qs(query).items()}
+
+
+class HTTPError(Exception):
+    """
+    Raised while reading or binding a request (or from a handler) to answer it
+    with an error status.
+    """
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+def _parse_content_length(value) -> int:
+    value = value.strip()
+    if not (value.isascii() and value.isdigit()):
+        raise HTTPError(400, "Invalid Content-Length")
+    return int(value)
+
+
+_TRUE_VALUES = frozenset(("1", "true", "yes", "on"))
+_FALSE_VALUES = frozenset(("0", "false", "no", "off"))
+
+
+def _to_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(f"invalid boolean value: {value!r}")
+
+
+def _to_int(value: str) -> int:
+    # Plain ASCII digits with an optional minus; int() alone would also take
+    # "+5", "1_0", surrounding whitespace and non-ASCII digits
+    digits = value[1:] if value.startswith("-") else value
+    if not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"invalid integer value: {value!r}")
+    return int(value)
+
+
+_FLOAT_CHARS = frozenset("0123456789+-.eE")
+
+
+def _to_float(value: str) -> float:
+    # Decimal/exponent notation only: no "nan"/"inf", underscores or whitespace,
+    # and no overflow to infinity ("1e999")
+    if not value or not _FLOAT_CHARS.issuperset(value):
+        raise ValueError(f"invalid float value: {value!r}")
+    result = float(value)
+    if not math.isfinite(result):
+        raise ValueError(f"invalid float value: {value!r}")
+    return result
+
+
+# Handler annotations that path/query strings are converted to before the call.
+# String keys cover modules using `from __future__ import annotations`.
+_CONVERTERS = {
+    int: _to_int, "int": _to_int,
+    float: _to_float, "float": _to_float,
+    bool: _to_bool, "bool": _to_bool,
+}
 
 
 @dataclass
@@ -20,16 +170,38 @@ class Request:
     path: str
     headers: dict = field(default_factory=dict)
     query_params: dict = field(default_factory=dict)
-    body: str = ""
+    body: bytes = b""
+    http_version: str = "HTTP/1.1"
+
+    @cached_property
+    def text(self) -> str:
+        """
+        Body decoded as UTF-8. Decoded lazily, on first access only.
+        """
+        return self.body.decode()
+
+    @cached_property
+    def _headers_lc(self) -> dict:
+        """
+        Headers keyed by lowercased name, built once on first lookup.
+        """
+        return {k.lower(): v for k, v in self.headers.items()}
+
+    def header(self, name: str, default=None):
+        """
+        Case-insensitive header lookup, e.g. request.header("content-type").
+        """
+        return self._headers_lc.get(name.lower(), default)
 
     def json(self):
         try:
-            return json.loads(self.body)
-        except json.JSONDecodeError:
+            return _json_loads(self.body)
+        except ValueError:
+            # JSONDecodeError, or UnicodeDecodeError for non UTF-8 bodies with stdlib json
             return None
     
     @classmethod
-    def from_raw(cls, header_text: str, body_text: str):
+    def from_raw(cls, header_text: str, body: bytes = b""):
         """
         Alternative constructor to create Request from raw HTTP request string.
 
@@ -41,18 +213,22 @@ class Request:
         body content
         """
 
-        header_lines = header_text.splitlines()
-        if not header_lines:
+        return cls._from_header_lines(header_text.splitlines(), body)
+
+    @classmethod
+    def _from_header_lines(cls, header_lines: list, body: bytes = b""):
+        """
+        Builds a Request from already split header lines (request line first).
+        """
+        if not header_lines or not header_lines[0]:
             raise ValueError("Empty HTTP request")
 
         # 1. Parse Method and Path
-        method, path, _ = header_lines[0].split()
+        method, target, http_version = header_lines[0].split()
 
         # 2. Parse URL & query params
-        parsed_url = urlparse(path)
-        path = parsed_url.path
-        raw_query_params = parse_qs(parsed_url.query)
-        query_params = {k: v[0] for k, v in raw_query_params.items()}
+        path, query = _split_target(target)
+        query_params = _parse_query(query)
 
         # 3. Parse Headers
         headers = {}
@@ -63,19 +239,26 @@ class Request:
 
         return cls(
             method=method,
-            path=parsed_url.path,
+            path=path,
             headers=headers,
             query_params=query_params,
-            body=body_text
+            body=body,
+            http_version=http_version
         )
     
     @classmethod
-    async def from_stream(cls, reader: asyncio.StreamReader):
+    async def from_stream(cls, reader: asyncio.StreamReader, header_timeout: float = None):
         """
         Alternative constructor to create Request from asyncio StreamReader.
         It reads bytes from the socket until the full HTTP request is received.
         Splits headers from body based on double CRLF.
-        Returns a Request instance.
+        `header_timeout` bounds the wait for the header block only; the body is read
+        without a deadline so slow uploads are not cut off.
+        Returns a Request instance, or None if the client closed the connection
+        before sending anything.
+        Raises HTTPError for requests whose body length cannot be determined safely
+        (Transfer-Encoding, duplicate or invalid Content-Length), since on a keep-alive
+        connection a misread body would be parsed as the next request.
 
         ```
         HTTP Request Format:
@@ -86,29 +269,145 @@ class Request:
         Body Content
         ```
         """
+        header_data = await cls._read_header_block(reader, header_timeout)
+        if header_data is None:
+            return None
+        return await cls._from_header_block(reader, header_data)
 
-        header_data = b""
-        while b"\r\n\r\n" not in header_data:
-            chunk = await reader.read(1024)
-            if not chunk: break
-            header_data += chunk
+    @staticmethod
+    async def _read_header_block(reader: asyncio.StreamReader, header_timeout: float = None):
+        """
+        Waits for the next header block, up to and including the blank line.
+        Returns None if the client closed the connection before sending anything.
+        """
+        # Never read past the header block: on a keep-alive connection the bytes
+        # after this request's body belong to the next request
+        try:
+            return await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), header_timeout)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise
+        except asyncio.LimitOverrunError:
+            # Header block larger than the reader's limit (max_header_size)
+            raise HTTPError(431, "Request Header Fields Too Large")
 
-        headers, body = header_data.split(b"\r\n\r\n", 1)
-        request_text = headers.decode()
+    @classmethod
+    async def _from_header_block(cls, reader: asyncio.StreamReader, header_data: bytes):
+        """
+        Parses a header block from `_read_header_block` and reads the body that follows it.
+        """
+        if httptools is not None:
+            request, content_length = cls._from_httptools(header_data)
+        else:
+            # Split once; the same lines are reused for Content-Length and header parsing.
+            # Decoding the whole block avoids copying it to strip the final CRLF CRLF;
+            # the two trailing empty lines it leaves behind are skipped by the header loop.
+            try:
+                header_lines = header_data.decode().split("\r\n")
+            except UnicodeDecodeError as e:
+                raise HTTPError(400, "Malformed HTTP request") from e
+
+            content_length = None
+            for line in header_lines[1:]:
+                name, sep, value = line.partition(":")
+                if not sep:
+                    continue
+                name = name.strip().lower()
+                if name == "content-length":
+                    if content_length is not None:
+                        raise HTTPError(400, "Duplicate Content-Length")
+                    content_length = _parse_content_length(value)
+                elif name == "transfer-encoding":
+                    raise HTTPError(501, "Transfer-Encoding is not supported")
 
-        content_length = 0
-        for line in request_text.splitlines():
-            if line.lower().startswith("content-length:"):
-                content_length = int(line.split(":")[1].strip())
-                break
-        
-        if (remaining := content_length - len(body)) > 0:
-            body += await reader.readexactly(remaining)
+            try:
+                request = cls._from_header_lines(header_lines)
+            except ValueError as e:
+                raise HTTPError(400, "Malformed HTTP request") from e
         
-        body_text = body.decode()
+        if content_length:
+            request.body = await reader.readexactly(content_length)
+
+        return request
+
+    @classmethod
+    def _from_httptools(cls, header_data: bytes) -> tuple:
+        """
+        Parses a complete header block with httptools' C parser.
+        Returns (request without body, content_length).
+        """
+        sink = _HttpToolsSink()
+        parser = httptools.HttpRequestParser(sink)
+        try:
+            parser.feed_data(header_data)
+        except httptools.HttpParserUpgrade:
+            pass
+        except httptools.HttpParserError as e:
+            raise HTTPError(400, "Malformed HTTP request") from e
+
+        if sink.framing_error is not None:
+            raise sink.framing_error
+
+        try:
+            path, query = _split_target(sink.url.decode())
+            request = cls(
+                method=parser.get_method().decode(),
+                path=path,
+                headers=sink.headers,
+                query_params=_parse_query(query),
+                http_version=f"HTTP/{parser.get_http_version()}"
+            )
+        except ValueError as e:
+            raise HTTPError(400, "Malformed HTTP request") from e
+        return request, sink.content_length
+
 
-        return cls.from_raw(request_text, body_text)
+class _HttpToolsSink:
+    """
+    Callback target for httptools.HttpRequestParser; collects the URL and headers.
+    """
+    __slots__ = ("url", "headers", "content_length", "framing_error")
 
+    def __init__(self):
+        self.url = b""
+        self.headers = {}
+        self.content_length = None
+        # Recorded rather than raised: httptools wraps exceptions raised in callbacks
+        self.framing_error = None
+
+    def on_url(self, url: bytes) -> None:
+        self.url += url
+
+    def on_header(self, name: bytes, value: bytes) -> None:
+        key = name.decode()
+        self.headers[key] = value.decode()
+        lowered = key.lower()
+        if self.framing_error is not None:
+            return
+        if lowered == "content-length":
+            if self.content_length is not None:
+                self.framing_error = HTTPError(400, "Duplicate Content-Length")
+            else:
+                try:
+                    self.content_length = _parse_content_length(self.headers[key])
+                except HTTPError as e:
+                    self.framing_error = e
+        elif lowered == "transfer-encoding":
+            self.framing_error = HTTPError(501, "Transfer-Encoding is not supported")
+
+
+
+class _Connection:
+    """
+    Bookkeeping for a connection being served by `Looplite.handle`.
+    """
+    __slots__ = ("writer", "awaiting_headers")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        # True while idle between requests, i.e. safe to close on shutdown
+        self.awaiting_headers = False
 
 
 @dataclass
@@ -123,15 +422,22 @@ class Response:
             return self.body
     
         try:
-            if isinstance(self.body, bytes):
-                return json.loads(self.body.decode())
-            return json.loads(str(self.body))
+            if isinstance(self.body, (bytes, str)):
+                return _json_loads(self.body)
+            return _json_loads(str(self.body))
         except (json.JSONDecodeError, UnicodeDecodeError):
             return None
     
     def to_bytes(self) -> bytes:
+        return b"".join(self.to_chunks())
+
+    def to_chunks(self) -> tuple:
+        """
+        Serializes the response as (header_bytes, body_bytes), so the body can be
+        handed to the transport as-is instead of being copied into one buffer.
+        """
         if isinstance(self.body, (dict, list)):
-            body_bytes = json.dumps(self.body).encode("utf-8")
+            body_bytes = _json_dumps(self.body)
             self.headers.setdefault("Content-Type", "application/json")
         elif isinstance(self.body, str):
             body_bytes = self.body.encode("utf-8")
@@ -145,120 +451,437 @@ class Response:
 
         self.headers["Content-Length"] = str(len(body_bytes))
 
-        status_map = {200: "200 OK", 404: "404 Not Found", 500: "500 Internal Server Error"}
-        status_text = status_map.get(self.status_code, "Unknown Status")
-
         header_lines = "".join(f"{k}: {v}\r\n" for k, v in self.headers.items())
+        header_bytes = b"".join((
+            _status_line(self.status_code),
+            header_lines.encode("utf-8"),
+            b"\r\n",
+        ))
 
-        header = (
-            f"HTTP/1.1 {status_text}\r\n"
-            f"{header_lines}"
-            f"\r\n"
-        )
+        return header_bytes, body_bytes
 
-        return header.encode("utf-8") + body_bytes
 
+@dataclass
+class _RouteNode:
+    """
+    One path segment of the route trie.
+
+    Children are tried in order: literal segment, mixed segment pattern
+    (e.g. "v<version>.json"), then a whole-segment <variable>.
+    Captured values are collected positionally; the names live on the route itself.
+    Mixed segment patterns are kept as parallel lists (regex i leads to node i).
+    """
+    literals: dict = field(default_factory=dict)
+    pattern_regexes: list = field(default_factory=list)
+    pattern_nodes: list = field(default_factory=list)
+    param: "_RouteNode" = None
+    route: tuple = None
+    _combined: re.Pattern = field(default=None, repr=False, compare=False)
+
+    def child(self, segment: str) -> tuple:
+        """
+        Returns (creating it if needed) the child node for a route segment,
+        plus the variable names that segment captures.
+        """
+        names = _VAR_RE.findall(segment)
+        if not names:
+            return self.literals.setdefault(segment, _RouteNode()), names
+
+        if _VAR_RE.fullmatch(segment):
+            if self.param is None:
+                self.param = _RouteNode()
+            return self.param, names
+
+        # split() also returns the captured names; literals are every other item
+        parts = _VAR_RE.split(segment)[::2]
+        regex = "([^/]+)".join(re.escape(part) for part in parts)
+        for i, compiled in enumerate(self.pattern_regexes):
+            if compiled.pattern == regex:
+                return self.pattern_nodes[i], names
+        node = _RouteNode()
+        self.pattern_regexes.append(re.compile(regex))
+        self.pattern_nodes.append(node)
+        self._combined = None
+        return node, names
+
+    def combined_patterns(self) -> re.Pattern:
+        """
+        All mixed segment patterns fused into one alternation, so a single regex
+        scan picks the first candidate. Built lazily and reset whenever a pattern is added.
+        """
+        if self._combined is None:
+            self._combined = re.compile("|".join(
+                f"(?P<_p{i}>{compiled.pattern})" for i, compiled in enumerate(self.pattern_regexes)
+            ))
+        return self._combined
 
-class Looplite:
-    def __init__(self):
-        self.routes = []
-    
-    def _get_args(self, handler, request: Request, params: dict) -> dict:
+    def match(self, segments: list, index: int, values: list):
         """
-        Gets arguments for the handler function based on its signature.
-        It matches parameters from path variables, query parameters, and body JSON.
+        Walks the remaining segments, backtracking on dead ends.
+        Returns the route stored at the matching leaf, or None.
         """
-        sig = inspect.signature(handler)
-        bound_args = sig.bind_partial()
+        if index == len(segments):
+            return self.route
 
-        if "request" in sig.parameters:
-            bound_args.arguments["request"] = request
+        segment = segments[index]
+        node = self.literals.get(segment)
+        if node is not None:
+            route = node.match(segments, index + 1, values)
+            if route is not None:
+                return route
 
-        # 1. Path parameters
-        for name, value in params.items():
-            if name in sig.parameters:
-                bound_args.arguments[name] = value
+        if not segment:
+            return None
+
+        match = self.combined_patterns().fullmatch(segment) if self.pattern_regexes else None
+        if match:
+            first = int(match.lastgroup[2:])
+            start = match.re.groupindex[match.lastgroup]
+            regexes = self.pattern_regexes
+            for i in range(first, len(regexes)):
+                compiled = regexes[i]
+                if match is not None:
+                    # Read only this alternative's groups instead of copying all of them
+                    first_group = start + 1
+                    if compiled.groups == 1:
+                        groups = (match.group(first_group),)
+                    else:
+                        groups = match.group(*range(first_group, first_group + compiled.groups))
+                    match = None
+                else:
+                    # Backtracking past the first candidate: try the rest one by one
+                    pattern_match = compiled.fullmatch(segment)
+                    if not pattern_match:
+                        continue
+                    groups = pattern_match.groups()
+                values.extend(groups)
+                route = self.pattern_nodes[i].match(segments, index + 1, values)
+                if route is not None:
+                    return route
+                del values[-len(groups):]
+
+        if self.param is not None:
+            values.append(segment)
+            route = self.param.match(segments, index + 1, values)
+            if route is not None:
+                return route
+            values.pop()
+
+        return None
 
-        # 2. Query parameters
-        for name, param in sig.parameters.items():
-            if name in request.query_params and name not in bound_args.arguments:
-                bound_args.arguments[name] = request.query_params[name]
 
-        # 3. Body parameters (assuming JSON body)
-        body_json = request.json() or {}
-        for name, param in sig.parameters.items():
-            if name in body_json and name not in bound_args.arguments:
-                bound_args.arguments[name] = body_json[name]
+class Looplite:
+    def __init__(self):
+        self.static_routes = {}
+        self.trie = {}
+        self.keep_alive_timeout = 5.0
+        # Open connections being served: handler task -> _Connection
+        self._connections = {}
+        # Set once run() starts shutting down; busy connections close after their response
+        self._closing = False
+        # Upper bound for a request's header block, enforced by StreamReader.readuntil
+        self.max_header_size = 64 * 1024
+        # Per-request "Received ..." / "No route found ..." lines; turn off for benchmarks
+        # or behind a proxy that logs
+        self.access_log = True
+    
+    @staticmethod
+    def _handler_params(handler) -> tuple:
+        """
+        Returns the handler's parameters as (name, converter) pairs, where converter
+        comes from an int/float/bool annotation and is None otherwise.
+        Routes compute this once at registration so requests never touch inspect.
+        """
+        return tuple(
+            (name, _CONVERTERS.get(param.annotation))
+            for name, param in inspect.signature(handler).parameters.items()
+        )
 
-        return bound_args.arguments
+    def _get_args(self, handler, request: Request, params: dict, handler_params: tuple = None) -> dict:
+        """
+        Gets arguments for the handler function based on its signature.
+        It matches parameters from path variables, query parameters, and body JSON.
+        Path and query strings are converted according to the handler's annotations;
+        a value that doesn't convert raises HTTPError (404 for path, 400 for query).
+        `handler_params` is the tuple cached at registration; computed on the fly if omitted.
+        """
+        if handler_params is None:
+            handler_params = self._handler_params(handler)
+
+        kwargs = {}
+        remaining = []
+        for name, convert in handler_params:
+            if name == "request":
+                kwargs[name] = request
+            # 1. Path parameters
+            elif name in params:
+                value = params[name]
+                if convert:
+                    try:
+                        value = convert(value)
+                    except ValueError:
+                        # The path matched the pattern but names no valid resource
+                        raise HTTPError(404, "Not Found") from None
+                kwargs[name] = value
+            # 2. Query parameters
+            elif name in request.query_params:
+                value = request.query_params[name]
+                if convert:
+                    try:
+                        value = convert(value)
+                    except ValueError:
+                        raise HTTPError(400, f"Invalid value for query parameter '{name}'") from None
+                kwargs[name] = value
+            else:
+                remaining.append(name)
+
+        # 3. Body parameters, only parsed if something is still unbound and the body is JSON
+        if (
+            remaining
+            and request.body
+            and request.header("content-type", "").startswith("application/json")
+        ):
+            body_json = request.json()
+            if isinstance(body_json, dict):
+                for name in remaining:
+                    if name in body_json:
+                        kwargs[name] = body_json[name]
+
+        return kwargs
     
     def route(self, path: str, method=["GET"]) -> callable:
-        # 1. Transform <variable> to regex named groups
         def decorator(func):
-            regex_path = re.sub(r'<([^>]+)>', r'(?P<\1>[^/]+)', path)
-            regex_path = f"^{regex_path}$"
-            compiled_path = re.compile(regex_path)
+            handler_params = self._handler_params(func)
 
-            # 2. Register the route
             for m in method:
-                self.routes.append((m.upper(), compiled_path, func))
+                m = m.upper()
+
+                # 1. All-literal paths need no matching at all: one dict lookup
+                if "<" not in path:
+                    self.static_routes.setdefault(m, {}).setdefault(path, (func, handler_params))
+                    continue
+
+                # 2. Walk/extend the method's trie one path segment at a time
+                node = self.trie.setdefault(m, _RouteNode())
+                names = []
+                for segment in path.split("/"):
+                    node, segment_names = node.child(segment)
+                    names.extend(segment_names)
+
+                # 3. Register the route; the first registration of a path wins.
+                # Only captures the handler accepts are kept, as (name, capture index) slots
+                if node.route is None:
+                    accepted = {name for name, _ in handler_params}
+                    slots = tuple((name, i) for i, name in enumerate(names) if name in accepted)
+                    node.route = (func, handler_params, slots)
             return func
         return decorator
+
+    def _match_route(self, method: str, path: str) -> tuple:
+        """
+        Looks the path up in the static routes, then walks the route trie.
+        Returns (handler, handler_params, path_params) if found, else (None, None, None).
+        """
+        method = method.upper()
+        static = self.static_routes.get(method)
+        if static is not None:
+            route = static.get(path)
+            if route is not None:
+                return route[0], route[1], {}
+
+        root = self.trie.get(method)
+        if root is not None:
+            values = []
+            route = root.match(path.split("/"), 0, values)
+            if route is not None:
+                handler, handler_params, slots = route
+                return handler, handler_params, {name: values[i] for name, i in slots}
+        return None, None, None
     
     def get_handler_and_path_params(self, method: str, path: str) -> tuple:
         """
         Searches through registered routes and returns (handler, path_params) if found, else (None, None).
         """
-        for m, regex, handler in self.routes:
-            if m == method.upper():
-                match = regex.match(path)
-                if match:
-                    return handler, match.groupdict()
-        return None, None
+        handler, _, path_params = self._match_route(method, path)
+        return handler, path_params
 
     
-    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    async def _dispatch(self, request: Request) -> Response:
         """
-        Main request handler that processes incoming HTTP requests.
+        Resolves the route for a request, calls its handler and returns the Response.
         """
+        if self.access_log and _log.isEnabledFor(logging.INFO):
+            _log.info("Received %s request for %s", request.method, request.path)
+        # 1. Route resolution
+        handler, handler_params, path_params = self._match_route(request.method, request.path)
 
-        # 1. Request Object Creation
-        request = await Request.from_stream(reader)
-        logging.info(f"Received {request.method} request for {request.path}")
-        # 2. Route resolution
-        handler, path_params = self.get_handler_and_path_params(request.method, request.path)
-
-        response = None
         if handler:
             try:
-                # 1. Prepare argument to pass to handler
-                # 2. Call handler
-                result = await handler(**self._get_args(handler, request, path_params))
+                # 2. Prepare argument to pass to handler and call it
+                result = await handler(**self._get_args(handler, request, path_params, handler_params))
                 # 3. Create Response
-                response = result if isinstance(result, Response) else Response(body=result)
+                return result if isinstance(result, Response) else Response(body=result)
+            except HTTPError as e:
+                return Response(status_code=e.status_code, body={"error": e.message})
             except Exception as e:
-                logging.error(f"Error in handler: {e}")
-                response = Response(
+                _log.error("Error in handler: %s", e)
+                return Response(
                     status_code=500,
                     body={"error": "Internal Server Error", "message": str(e)}
                 )
-        else:
-            logging.warning(f"No route found for {request.method} {request.path}")
-            response = Response(
-                status_code=404,
-                body={"error": "Not Found"}
-            )
-        
-        # 4. Send response
-        writer.write(response.to_bytes())
-        await writer.drain()
-        writer.close()
+
+        if self.access_log and _log.isEnabledFor(logging.WARNING):
+            _log.warning("No route found for %s %s", request.method, request.path)
+        return Response(
+            status_code=404,
+            body=_NOT_FOUND_BODY,
+            content_type="application/json"
+        )
+
+    @staticmethod
+    def _keep_alive(request: Request) -> bool:
+        """
+        HTTP/1.1 connections persist unless the client sends `Connection: close`;
+        HTTP/1.0 ones only if it sends `Connection: keep-alive`.
+        """
+        connection = request.header("connection", "").lower()
+        if request.http_version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Main connection handler that processes incoming HTTP requests.
+        Serves requests on the connection until the client closes it, asks to close it,
+        or stays idle for longer than `keep_alive_timeout` seconds.
+        """
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        task = asyncio.current_task()
+        connection = self._connections[task] = _Connection(writer)
+        try:
+            while True:
+                # 1. Request Object Creation
+                try:
+                    connection.awaiting_headers = True
+                    try:
+                        header_data = await Request._read_header_block(reader, self.keep_alive_timeout)
+                    finally:
+                        connection.awaiting_headers = False
+                    # Closed by a shutdown after the headers arrived but before we resumed
+                    if header_data is None or writer.is_closing():
+                        break
+                    request = await Request._from_header_block(reader, header_data)
+                except HTTPError as e:
+                    # The stream can't be trusted past this request: answer and close
+                    response = Response(
+                        status_code=e.status_code,
+                        headers={"Connection": "close"},
+                        body={"error": e.message}
+                    )
+                    writer.writelines(response.to_chunks())
+                    await writer.drain()
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                # 2. Route, call handler, build Response
+                response = await self._dispatch(request)
+
+                # A shutdown that started mid-request closes the connection after this response
+                keep_alive = self._keep_alive(request) and not self._closing
+                if not keep_alive:
+                    response.headers["Connection"] = "close"
+
+                # 3. Send response
+                writer.writelines(response.to_chunks())
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            self._connections.pop(task, None)
     
-    async def run(self, host="127.0.0.1", port=8080):
-        server = await asyncio.start_server(self.handle, host, port)
-        logging.info(f"Looplite server running on {host}:{port}")
+    async def run(self, host="127.0.0.1", port=8080, reuse_port=hasattr(socket, "SO_REUSEPORT")):
+        """
+        Serves forever. With `reuse_port`, several worker processes can bind the same port
+        and let the kernel spread connections between them.
+        """
+        server = await asyncio.start_server(
+            self.handle, host, port, reuse_port=reuse_port, limit=self.max_header_size
+        )
+        _log.info("Looplite server running on %s:%s", host, port)
+        self._closing = False
         async with server:
-            await server.serve_forever()
+            try:
+                # Serve until cancelled. Not serve_forever(): on 3.12+ its cancellation
+                # waits for every open connection before the cleanup below can run
+                await asyncio.get_running_loop().create_future()
+            finally:
+                # Stop accepting and close keep-alive connections idling between requests.
+                # Busy ones finish their current response (sent with Connection: close)
+                # rather than being cut off or cancelled mid-request
+                server.close()
+                self._closing = True
+                for connection in list(self._connections.values()):
+                    if connection.awaiting_headers:
+                        connection.writer.close()
+                await asyncio.gather(*self._connections, return_exceptions=True)
+
+    def serve(self, host="127.0.0.1", port=8080, loop_factory=None, **kwargs) -> None:
+        """
+        Blocking entry point that runs `run()` on an event loop created by `loop_factory`.
+        Defaults to uvloop when it is installed and to asyncio's own loop otherwise;
+        any other loop implementation (e.g. an io_uring-backed one) plugs in the same way.
+        """
+        if loop_factory is None:
+            loop_factory = uvloop.new_event_loop if uvloop is not None else asyncio.new_event_loop
+
+        if sys.version_info >= (3, 11):
+            # Runner turns Ctrl-C into a cancel of the main task and tears the loop down
+            with asyncio.Runner(loop_factory=loop_factory) as runner:
+                runner.run(self.run(host, port, **kwargs))
+            return
+
+        # Python 3.10 has no Runner: same SIGINT handling and teardown, done by hand
+        loop = loop_factory()
+        asyncio.set_event_loop(loop)
+        main = loop.create_task(self.run(host, port, **kwargs))
+        interrupted = False
+
+        def on_sigint(signum, frame):
+            nonlocal interrupted
+            interrupted = True
+            loop.call_soon_threadsafe(main.cancel)
+
+        previous_handler = None
+        if (
+            threading.current_thread() is threading.main_thread()
+            and signal.getsignal(signal.SIGINT) is signal.default_int_handler
+        ):
+            previous_handler = signal.signal(signal.SIGINT, on_sigint)
+
+        try:
+            loop.run_until_complete(main)
+        except asyncio.CancelledError:
+            if not interrupted:
+                raise
+            raise KeyboardInterrupt()
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGINT, previous_handler)
+            try:
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
 
 
 app = Looplite()
@@ -280,7 +903,7 @@ async def get_user_info(user_id: str, username: str):
 # Addition route, uses path parameters
 @app.route("/add/<a>/<b>", method=["GET"])
 async def add(a: int, b: int):
-    result = int(a) + int(b)
+    result = a + b
     return Response(body={"result": result}, content_type="application/json")
 
 
@@ -303,7 +926,7 @@ async def status():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(app.run())
+        app.serve()
     except KeyboardInterrupt:
-        logging.info("Server stopped by user")
+        _log.info("Server stopped by user")
         pass
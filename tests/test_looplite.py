@@ -1,4 +1,5 @@
 import pytest
+from looplite import looplite as looplite_module
 from looplite.looplite import Looplite, Request, Response
 
 
@@ -9,8 +10,32 @@ def app():
     """
     return Looplite()
 
+@pytest.fixture(params=["httptools", "python"])
+def header_parser(request, monkeypatch):
+    """
+    Runs a test against both header parsers: httptools (skipped if not installed) and the pure-Python one.
+    """
+    if request.param == "httptools":
+        pytest.importorskip("httptools")
+    else:
+        monkeypatch.setattr(looplite_module, "httptools", None)
+    return request.param
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_codec(request, monkeypatch):
+    """
+    Runs a test against both JSON codecs: orjson (skipped if not installed) and the stdlib fallback.
+    """
+    if request.param == "orjson":
+        if looplite_module.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(looplite_module, "_json_dumps", looplite_module._stdlib_json_dumps)
+        monkeypatch.setattr(looplite_module, "_json_loads", looplite_module.json.loads)
+    return request.param
+
 # ---- 1 Unit Tests Request, Response Classes ----
-def test_request_parsing_from_stream():
+def test_request_parsing_from_stream(header_parser):
     """
     Test Request.from_stream method to ensure it correctly parses an HTTP request from a stream.
     """
@@ -38,11 +63,13 @@ def test_request_parsing_from_stream():
         assert request.query_params == {"param": "value"}
         assert request.headers["Host"] == "localhost"
         assert request.headers["Content-Length"] == "11"
-        assert request.body == "Hello World"
+        assert request.body == b"Hello World"
+        assert request.text == "Hello World"
+        assert request.http_version == "HTTP/1.1"
 
     asyncio.run(test())
 
-def test_request_parsing_from_raw():
+def test_request_parsing_from_raw(json_codec):
     """
     Test Request.from_raw method to ensure it correctly parses an HTTP request from raw text.
     """
@@ -52,9 +79,9 @@ def test_request_parsing_from_raw():
         "Content-Type: application/json\r\n" \
         "Content-Length: 15\r\n"
     )
-    body_text = '{"key":"value"}'
+    body = b'{"key":"value"}'
 
-    request = Request.from_raw(raw_headers, body_text)
+    request = Request.from_raw(raw_headers, body)
 
     assert request.method == "POST"
     assert request.path == "/api/data"
@@ -63,6 +90,30 @@ def test_request_parsing_from_raw():
     assert request.headers["Content-Type"] == "application/json"
     assert request.headers["Content-Length"] == "15"
     assert request.json() == {"key": "value"}
+    assert request.header("content-type") == "application/json"
+    assert request.header("CONTENT-LENGTH") == "15"
+    assert request.header("X-Missing", "default") == "default"
+
+
+def test_request_json_invalid_body(json_codec):
+    """
+    Test that Request.json returns None for non-JSON and non UTF-8 bodies instead of raising.
+    """
+    assert Request(method="POST", path="/", body=b"not json").json() is None
+    assert Request(method="POST", path="/", body=b"\xff\xfe{").json() is None
+
+
+def test_request_target_parsing():
+    """
+    Test that origin-form and absolute-form request targets split into path and query.
+    """
+    request = Request.from_raw("GET /search?q=loop&page=2#top HTTP/1.1\r\nHost: x\r\n")
+    assert request.path == "/search"
+    assert request.query_params == {"q": "loop", "page": "2"}
+
+    request = Request.from_raw("GET http://example.com/status HTTP/1.1\r\n")
+    assert request.path == "/status"
+    assert request.query_params == {}
 
 
 def test_response_to_bytes():
@@ -80,6 +131,11 @@ def test_response_to_bytes():
     assert b"Content-Type: text/plain" in response_bytes
     assert b"Hello, World!" in response_bytes
 
+    header_bytes, body_bytes = response.to_chunks()
+    assert header_bytes.endswith(b"\r\n\r\n")
+    assert body_bytes == b"Hello, World!"
+    assert header_bytes + body_bytes == response_bytes
+
 
 def test_dependency_injection(app):
     """
@@ -95,7 +151,7 @@ def test_dependency_injection(app):
         path="/items/123",
         query_params={"sort": "asc", "name": "test"},
         headers={},
-        body='{"name": "foo", "value": 10}'
+        body=b'{"name": "foo", "value": 10}'
     )
     path_params = {"item_id": "123"}
 
@@ -109,6 +165,147 @@ def test_dependency_injection(app):
     assert "value" not in kwargs  # 'value' is not a parameter of handler
 
 
+def test_body_params_require_json_content_type(app, json_codec):
+    """
+    Test that body parameters are only injected from JSON bodies, and only when still unbound.
+    """
+
+    async def handler(data, sort):
+        pass
+
+    body = b'{"data": {"a": 1}, "sort": "desc"}'
+    json_req = Request(
+        method="POST",
+        path="/submit",
+        query_params={"sort": "asc"},
+        headers={"content-type": "application/json"},
+        body=body
+    )
+    text_req = Request(
+        method="POST",
+        path="/submit",
+        headers={"Content-Type": "text/plain"},
+        body=body
+    )
+
+    assert app._get_args(handler, json_req, {}) == {"data": {"a": 1}, "sort": "asc"}
+    assert app._get_args(handler, text_req, {}) == {}
+
+
+@pytest.mark.asyncio
+async def test_annotated_params_are_converted(app):
+    """
+    Test that int/float/bool annotations convert path and query strings once, before the call.
+    """
+
+    @app.route("/sum/<a>/<b>")
+    async def add(a: int, b: int, scale: float, verbose: bool, label: str):
+        return {"result": (a + b) * scale, "verbose": verbose, "label": label}
+
+    req = Request(
+        method="GET",
+        path="/sum/2/3",
+        query_params={"scale": "1.5", "verbose": "false", "label": "x"}
+    )
+    handler, handler_params, path_params = app._match_route(req.method, req.path)
+
+    result = await handler(**app._get_args(handler, req, path_params, handler_params))
+
+    assert result == {"result": 7.5, "verbose": False, "label": "x"}
+
+
+@pytest.mark.asyncio
+async def test_unconvertible_params_are_client_errors(app):
+    """
+    A path capture that doesn't convert is a 404, a query value a 400; no internal error text leaks.
+    """
+
+    @app.route("/add/<a>/<b>")
+    async def add(a: int, b: int, verbose: bool = False, scale: float = 1.0):
+        return {"result": (a + b) * scale}
+
+    for value in ("abc", "1_0", "+5", " 5", "5\n", "\u0661", "-", "1.5"):
+        bad_path = await app._dispatch(Request(method="GET", path=f"/add/{value}/1"))
+        assert bad_path.status_code == 404, value
+        assert bad_path.body == {"error": "Not Found"}
+
+    for name, value in (
+        ("verbose", "maybe"), ("verbose", "2"),
+        ("scale", "nan"), ("scale", "inf"), ("scale", "-Infinity"), ("scale", "1e999"),
+        ("scale", "1_0"), ("scale", " 1"), ("scale", ""),
+    ):
+        bad_query = await app._dispatch(
+            Request(method="GET", path="/add/1/1", query_params={name: value})
+        )
+        assert bad_query.status_code == 400, value
+        assert bad_query.body == {"error": f"Invalid value for query parameter '{name}'"}
+
+    ok = await app._dispatch(Request(
+        method="GET", path="/add/-1/3", query_params={"verbose": "off", "scale": "2.5e0"}
+    ))
+    assert ok.status_code == 200
+    assert ok.body == {"result": 5.0}
+
+
+def test_route_matching(app):
+    """
+    Test trie-based route resolution: literals, variables, mixed segments, methods and misses.
+    """
+
+    @app.route("/users/<id>")
+    async def get_user(id):
+        pass
+
+    @app.route("/users/me")
+    async def get_me():
+        pass
+
+    @app.route("/users/<id>/posts/<post_id>")
+    async def get_post(id, post_id):
+        pass
+
+    @app.route("/users/me/settings", method=["POST"])
+    async def update_settings():
+        pass
+
+    @app.route("/files/<name>.<ext>")
+    async def get_file(name, ext):
+        pass
+
+    @app.route("/orgs/<org>/teams/<team>")
+    async def get_team(team):
+        pass
+
+    @app.route("/docs/<name>.<ext>/meta")
+    async def get_doc_meta(name, ext):
+        pass
+
+    @app.route("/docs/v<version>")
+    async def get_doc_version(version):
+        pass
+
+    assert app.get_handler_and_path_params("GET", "/users/42") == (get_user, {"id": "42"})
+    assert app.get_handler_and_path_params("GET", "/users/me") == (get_me, {})
+    assert "/users/me" in app.static_routes["GET"]
+    assert app.get_handler_and_path_params("get", "/users/me/posts/7") == (
+        get_post, {"id": "me", "post_id": "7"}
+    )
+    assert app.get_handler_and_path_params("POST", "/users/me/settings") == (update_settings, {})
+    assert app.get_handler_and_path_params("GET", "/files/report.pdf") == (
+        get_file, {"name": "report", "ext": "pdf"}
+    )
+    assert app.get_handler_and_path_params("GET", "/docs/v1.2/meta") == (
+        get_doc_meta, {"name": "v1", "ext": "2"}
+    )
+    assert app.get_handler_and_path_params("GET", "/docs/v1.2") == (get_doc_version, {"version": "1.2"})
+    assert app.get_handler_and_path_params("GET", "/docs/v3") == (get_doc_version, {"version": "3"})
+    # Captures the handler does not accept are never materialized
+    assert app.get_handler_and_path_params("GET", "/orgs/acme/teams/core") == (get_team, {"team": "core"})
+    assert app.get_handler_and_path_params("GET", "/users/") == (None, None)
+    assert app.get_handler_and_path_params("GET", "/users/42/") == (None, None)
+    assert app.get_handler_and_path_params("POST", "/users/42") == (None, None)
+
+
 # ---- Integration Tests ----
 
 @pytest.mark.asyncio
@@ -155,4 +352,388 @@ async def test_manual_response_creation(app):
         assert isinstance(result, Response)
         assert result.status_code == 200
         assert result.headers["Content-Disposition"] == 'attachment; filename="file.txt"'
-        assert result.body == "File content"
\ No newline at end of file
+        assert result.body == "File content"
+
+def test_response_status_lines():
+    """
+    Test that known and unlisted status codes both produce a valid status line.
+    """
+    assert Response(status_code=404).to_bytes().startswith(b"HTTP/1.1 404 Not Found\r\n")
+    assert Response(status_code=201).to_bytes().startswith(b"HTTP/1.1 201 Created\r\n")
+    assert Response(status_code=599).to_bytes().startswith(b"HTTP/1.1 599 Unknown Status\r\n")
+
+
+@pytest.mark.parametrize("payload", [
+    {"message": "hi", "items": [1, 2]},
+    {"big": 2 ** 70},
+])
+def test_response_json_body_to_bytes(json_codec, payload):
+    """
+    Test that dict/list bodies are serialized as JSON with the right headers.
+    Values orjson can't encode (integers beyond 64 bits) fall back to the stdlib encoder.
+    """
+    response = Response(body=payload)
+
+    response_bytes = response.to_bytes()
+    header, body = response_bytes.split(b"\r\n\r\n", 1)
+
+    assert b"Content-Type: application/json" in header
+    assert f"Content-Length: {len(body)}".encode() in header
+    assert Response(body=body).json() == payload
+
+
+class FakeWriter:
+    """
+    Minimal stand-in for asyncio.StreamWriter that records what is written.
+    """
+    def __init__(self):
+        self.data = b""
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    def writelines(self, chunks):
+        for chunk in chunks:
+            self.write(chunk)
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def is_closing(self):
+        return self.closed
+
+    async def wait_closed(self):
+        pass
+
+    def get_extra_info(self, name, default=None):
+        return default
+
+
+@pytest.mark.asyncio
+async def test_handle_end_to_end(app, header_parser):
+    """
+    Drives Looplite.handle with a raw request: parsing, routing, injection and serialization.
+    """
+    import asyncio
+
+    @app.route("/items/<item_id>", method=["POST"])
+    async def update_item(item_id, sort, name):
+        return {"item_id": item_id, "sort": sort, "name": name}
+
+    body = b'{"name": "foo"}'
+    reader = asyncio.StreamReader()
+    reader.feed_data(
+        b"POST /items/7?sort=asc HTTP/1.1\r\n"
+        b"Host: localhost\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+        b"\r\n" + body
+    )
+    reader.feed_eof()
+    writer = FakeWriter()
+
+    await app.handle(reader, writer)
+
+    header, response_body = writer.data.split(b"\r\n\r\n", 1)
+    assert header.startswith(b"HTTP/1.1 200 OK")
+    assert Response(body=response_body).json() == {"item_id": "7", "sort": "asc", "name": "foo"}
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+async def test_handle_keep_alive(app, header_parser):
+    """
+    Serves several requests on one connection and stops after `Connection: close`.
+    """
+    import asyncio
+
+    @app.route("/ping")
+    async def ping():
+        return "pong"
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(
+        b"GET /ping HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        b"GET /missing HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        b"GET /ping HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+        b"GET /ping HTTP/1.1\r\nHost: localhost\r\n\r\n"
+    )
+    writer = FakeWriter()
+
+    await app.handle(reader, writer)
+
+    assert writer.data.count(b"HTTP/1.1 200 OK") == 2
+    assert writer.data.count(b"HTTP/1.1 404 Not Found") == 1
+    assert writer.data.count(b"Connection: close") == 1
+    assert writer.data.endswith(b"pong")
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+async def test_handle_rejects_oversized_headers(app):
+    """
+    A header block larger than the reader limit gets a 431 and the connection is closed.
+    """
+    import asyncio
+
+    reader = asyncio.StreamReader(limit=64)
+    reader.feed_data(b"GET / HTTP/1.1\r\nX-Padding: " + b"a" * 256 + b"\r\n\r\n")
+    writer = FakeWriter()
+
+    await app.handle(reader, writer)
+
+    assert writer.data.startswith(b"HTTP/1.1 431 Request Header Fields Too Large\r\n")
+    assert b"Connection: close" in writer.data
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw", [
+    b"GET http://[::1/x HTTP/1.1\r\nHost: localhost\r\n\r\n",
+    b"GET /caf\xe9 HTTP/1.1\r\nHost: localhost\r\n\r\n",
+])
+async def test_handle_rejects_malformed_target(app, header_parser, raw):
+    """
+    A request target that can't be parsed gets a 400 from either parser, not a silent close.
+    """
+    import asyncio
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(raw)
+    reader.feed_eof()
+    writer = FakeWriter()
+
+    await app.handle(reader, writer)
+
+    assert writer.data.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert b"Connection: close" in writer.data
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("framing, status", [
+    (b"Transfer-Encoding: chunked\r\n", b"501 Not Implemented"),
+    (b"Content-Length: 0\r\nContent-Length: 44\r\n", b"400 Bad Request"),
+    (b"Content-Length: +44\r\n", b"400 Bad Request"),
+])
+async def test_handle_rejects_ambiguous_body_framing(app, header_parser, framing, status):
+    """
+    A body whose length can't be determined safely must not be parsed as a pipelined request.
+    """
+    import asyncio
+
+    @app.route("/public", method=["POST"])
+    async def public():
+        return "PUBLIC"
+
+    @app.route("/admin")
+    async def admin():
+        return "ADMIN REACHED"
+
+    smuggled = b"GET /admin HTTP/1.1\r\nHost: localhost\r\n\r\n"
+    reader = asyncio.StreamReader()
+    reader.feed_data(
+        b"POST /public HTTP/1.1\r\nHost: localhost\r\n" + framing + b"\r\n"
+        + hex(len(smuggled))[2:].encode() + b"\r\n" + smuggled + b"\r\n0\r\n\r\n"
+    )
+    reader.feed_eof()
+    writer = FakeWriter()
+
+    await app.handle(reader, writer)
+
+    assert b"ADMIN REACHED" not in writer.data
+    assert b"PUBLIC" not in writer.data
+    assert writer.data.startswith(b"HTTP/1.1 " + status + b"\r\n")
+    assert writer.data.count(b"HTTP/1.1 ") == 1
+    assert b"Connection: close" in writer.data
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+async def test_handle_idle_timeout_does_not_cut_off_slow_body(app):
+    """
+    The keep-alive idle timeout only applies to waiting for headers, not to reading the body.
+    """
+    import asyncio
+
+    @app.route("/upload", method=["POST"])
+    async def upload(request):
+        return request.text
+
+    app.keep_alive_timeout = 0.05
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"POST /upload HTTP/1.1\r\nContent-Length: 10\r\n\r\nhello")
+    writer = FakeWriter()
+
+    async def slow_client():
+        await asyncio.sleep(0.2)
+        reader.feed_data(b"world")
+
+    client = asyncio.create_task(slow_client())
+    await app.handle(reader, writer)
+    await client
+
+    assert writer.data.startswith(b"HTTP/1.1 200 OK")
+    assert writer.data.endswith(b"helloworld")
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_idle_connections_and_finishes_busy_ones(app, header_parser):
+    """
+    Cancelling run() closes keep-alive connections waiting for their next request right away,
+    while a request already being handled still gets its full response, sent with Connection: close.
+    """
+    import asyncio
+    import socket
+
+    started = asyncio.Event()
+
+    @app.route("/ping")
+    async def ping():
+        return "pong"
+
+    @app.route("/slow")
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.1)
+        return "done"
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = asyncio.create_task(app.run("127.0.0.1", port, reuse_port=False))
+    for _ in range(100):
+        try:
+            idle_reader, idle_writer = await asyncio.open_connection("127.0.0.1", port)
+            break
+        except ConnectionRefusedError:
+            await asyncio.sleep(0.01)
+
+    # Leave one connection idle between keep-alive requests ...
+    idle_writer.write(b"GET /ping HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await idle_reader.readuntil(b"pong")
+    # ... and another one busy in a slow handler
+    busy_reader, busy_writer = await asyncio.open_connection("127.0.0.1", port)
+    busy_writer.write(b"GET /slow HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await started.wait()
+
+    server.cancel()
+    assert await asyncio.wait_for(idle_reader.read(), 1) == b""
+    response = await asyncio.wait_for(busy_reader.read(), 1)
+    with pytest.raises(asyncio.CancelledError):
+        await server
+
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert b"Connection: close" in response
+    assert response.endswith(b"done")
+    assert not app._connections
+    idle_writer.close()
+    busy_writer.close()
+
+
+@pytest.mark.asyncio
+async def test_access_log_gates_per_request_logging(app, caplog):
+    """
+    With access_log off, neither served requests nor 404s log anything per request.
+    """
+    import logging
+
+    app.access_log = False
+    with caplog.at_level(logging.INFO, logger="looplite.looplite"):
+        response = await app._dispatch(Request(method="GET", path="/missing"))
+
+    assert response.status_code == 404
+    assert caplog.records == []
+
+
+@pytest.fixture(params=["runner", "manual"])
+def serve_path(request, monkeypatch):
+    """
+    Runs a serve() test through asyncio.Runner (3.11+) and through the hand-written 3.10 teardown.
+    """
+    import types
+
+    if request.param == "runner":
+        if looplite_module.sys.version_info < (3, 11):
+            pytest.skip("asyncio.Runner needs Python 3.11+")
+    else:
+        monkeypatch.setattr(looplite_module, "sys", types.SimpleNamespace(version_info=(3, 10)))
+    return request.param
+
+
+@pytest.mark.parametrize("stop, raised", [("cancel", "CancelledError"), ("sigint", "KeyboardInterrupt")])
+def test_serve_uses_loop_factory_and_tears_down(app, serve_path, monkeypatch, stop, raised):
+    """
+    serve() runs run() on a loop from `loop_factory`; when the main task is cancelled, or Ctrl-C
+    cancels it, leftover tasks are cancelled and the loop is closed.
+    """
+    import asyncio
+    import signal
+
+    if stop == "sigint" and signal.getsignal(signal.SIGINT) is not signal.default_int_handler:
+        pytest.skip("SIGINT handler replaced by the test environment")
+
+    created = []
+    leftovers = []
+
+    def loop_factory():
+        loop = asyncio.new_event_loop()
+        created.append(loop)
+        return loop
+
+    async def run(host, port, **kwargs):
+        assert (host, port, kwargs) == ("127.0.0.1", 8081, {"reuse_port": False})
+        assert asyncio.get_running_loop() is created[0]
+        leftovers.append(asyncio.get_running_loop().create_task(asyncio.sleep(3600)))
+        if stop == "cancel":
+            asyncio.current_task().cancel()
+        else:
+            signal.raise_signal(signal.SIGINT)
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(app, "run", run)
+    exception = KeyboardInterrupt if raised == "KeyboardInterrupt" else asyncio.CancelledError
+    with pytest.raises(exception):
+        app.serve("127.0.0.1", 8081, loop_factory=loop_factory, reuse_port=False)
+
+    assert len(created) == 1
+    assert created[0].is_closed()
+    assert leftovers[0].cancelled()
+    assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+
+@pytest.mark.parametrize("uvloop_installed", [True, False])
+def test_serve_default_loop_factory(app, serve_path, monkeypatch, uvloop_installed):
+    """
+    Without a `loop_factory`, serve() uses uvloop when it is available and asyncio's loop otherwise.
+    """
+    import asyncio
+    import types
+
+    new_event_loop = asyncio.new_event_loop
+    created = []
+
+    def recording_new_event_loop():
+        loop = new_event_loop()
+        created.append(loop)
+        return loop
+
+    if uvloop_installed:
+        monkeypatch.setattr(looplite_module, "uvloop", types.SimpleNamespace(new_event_loop=recording_new_event_loop))
+    else:
+        monkeypatch.setattr(looplite_module, "uvloop", None)
+        monkeypatch.setattr(asyncio, "new_event_loop", recording_new_event_loop)
+
+    async def run(host, port):
+        assert asyncio.get_running_loop() is created[0]
+
+    monkeypatch.setattr(app, "run", run)
+    app.serve()
+
+    assert len(created) == 1
+    assert created[0].is_closed()